@@ -8,8 +8,19 @@
 
 import tkinter as tk
 import os
-from tkinter import ttk, messagebox, simpledialog, filedialog
-from TuringMachine import *
+from tkinter import ttk, messagebox
+from TuringMachine import TuringMachine
+from constants import BLANK_BYTE, StateView
+
+WHEEL_DEBOUNCE_MS = 16  # Интервал накопления событий колесика мыши (~1 кадр)
+BINARY_PROGRAM_EXT = '.turb'  # Расширение двоичных файлов программ
+TAPE_CELL_WIDTH = 50  # Ширина ячейки ленты в пикселях
+TAPE_START_X = 50  # Отступ первой ячейки ленты от края canvas
+TABLE_ROW_HEIGHT = 20  # Высота строки таблицы переходов в пикселях
+TABLE_HEADING_HEIGHT = 25  # Примерная высота заголовков таблицы переходов
+PROGRAM_FILETYPES = [("Turing machine files", "*.tur"),
+                     ("Binary Turing machine files", "*" + BINARY_PROGRAM_EXT),
+                     ("All files", "*.*")]
 
 
 class TransitionTableEditor:
@@ -41,15 +52,13 @@ class TransitionTableEditor:
         # Настройка canvas и скроллбаров
         self.canvas = tk.Canvas(table_container, bg='white')
 
-        # Вертикальный скроллбар
-        self.v_scrollbar = ttk.Scrollbar(table_container, orient="vertical",
-                                         command=self.canvas.yview)
+        # Вертикальный скроллбар (прокручивает строки самой таблицы)
+        self.v_scrollbar = ttk.Scrollbar(table_container, orient="vertical")
         # Горизонтальный скроллбар
         self.h_scrollbar = ttk.Scrollbar(table_container, orient="horizontal",
                                          command=self.canvas.xview)
 
-        self.canvas.configure(yscrollcommand=self.v_scrollbar.set,
-                              xscrollcommand=self.h_scrollbar.set)
+        self.canvas.configure(xscrollcommand=self.h_scrollbar.set)
 
         self.v_scrollbar.pack(side="right", fill="y")
         self.h_scrollbar.pack(side="bottom", fill="x")
@@ -59,102 +68,195 @@ class TransitionTableEditor:
         self.table_frame = ttk.Frame(self.canvas)
         self.canvas_window = self.canvas.create_window((0, 0), window=self.table_frame, anchor="nw")
 
+        # Таблица переходов - один виджет Treeview вместо сетки полей ввода.
+        # Высота таблицы ограничена видимой областью, поэтому Tk отрисовывает
+        # только видимые строки, а по вертикали прокручивается сама таблица
+        ttk.Style().configure('Treeview', rowheight=TABLE_ROW_HEIGHT)
+        self.visible_rows = 1
+        self.tree = ttk.Treeview(self.table_frame, show='tree headings', selectmode='none',
+                                 yscrollcommand=self.on_tree_yscroll)
+        self.v_scrollbar.configure(command=self.tree.yview)
+        self.tree.heading('#0', text='')
+        self.tree.column('#0', width=80, stretch=False)
+        self.tree.tag_configure('active', background='lightgreen')
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.bind("<Double-1>", self.on_cell_double_click)
+        self.cell_editor = None
+
         # Привязка событий для корректной работы прокрутки
+        self.last_bbox = None
         self.table_frame.bind("<Configure>", self.on_frame_configure)
         self.canvas.bind("<Configure>", self.on_canvas_configure)
 
-        # Поддержка прокрутки колесиком мыши
-        self.canvas.bind("<MouseWheel>", self.on_mousewheel)
-        self.canvas.bind("<Button-4>", self.on_mousewheel)
-        self.canvas.bind("<Button-5>", self.on_mousewheel)
-        # Горизонтальная прокрутка с Shift+колесико
-        self.canvas.bind("<Shift-MouseWheel>", self.on_shift_mousewheel)
-        self.canvas.bind("<Shift-Button-4>", self.on_shift_mousewheel)
-        self.canvas.bind("<Shift-Button-5>", self.on_shift_mousewheel)
+        # Поддержка прокрутки колесиком мыши (с накоплением событий).
+        # Таблица закрывает canvas, поэтому обработчики привязаны и к ней:
+        # они возвращают "break" и заменяют встроенную прокрутку Treeview
+        self.wheel_dy = 0
+        self.wheel_dx = 0
+        self.wheel_after = None
+        for widget in (self.canvas, self.tree):
+            widget.bind("<MouseWheel>", self.on_mousewheel)
+            widget.bind("<Button-4>", self.on_mousewheel)
+            widget.bind("<Button-5>", self.on_mousewheel)
+            # Горизонтальная прокрутка с Shift+колесико
+            widget.bind("<Shift-MouseWheel>", self.on_shift_mousewheel)
+            widget.bind("<Shift-Button-4>", self.on_shift_mousewheel)
+            widget.bind("<Shift-Button-5>", self.on_shift_mousewheel)
 
         # Инициализация данных
         self.states = machine.get_states()
         self.symbols = machine.get_symbols()
-        self.cells = {}
+        self.applied_values = {}  # (state, symbol) -> последнее примененное значение ячейки
+        self.active_state = None  # Подсвеченное состояние
 
         self.root = parent
         self.root.after(100, self.create_table)
 
     def on_frame_configure(self, event):
         """Обновляет область прокрутки при изменении размера фрейма."""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        bbox = self.canvas.bbox("all")
+        # Смена scrollregion заставляет Tk пересчитать прокрутку, поэтому только при изменении
+        if bbox != self.last_bbox:
+            self.last_bbox = bbox
+            self.canvas.configure(scrollregion=bbox)
 
     def on_canvas_configure(self, event):
-        """Обновляет размер окна canvas при изменении размера виджета."""
-        # Обновляем ширину внутреннего фрейма под размер canvas
-        pass
-        # Не устанавливаем высоту, чтобы фрейм мог быть выше canvas (для вертикальной прокрутки)
+        """Подгоняет число строк таблицы под высоту canvas при изменении размера виджета."""
+        self.visible_rows = max(1, (event.height - TABLE_HEADING_HEIGHT) // TABLE_ROW_HEIGHT)
+        self.fit_tree_height()
+
+    def fit_tree_height(self):
+        """Устанавливает высоту таблицы не больше числа видимых строк."""
+        self.tree.configure(height=max(1, min(len(self.states), self.visible_rows)))
+
+    def on_tree_yscroll(self, first, last):
+        """Синхронизирует скроллбар с таблицей и закрывает поле ввода ячейки."""
+        # Ячейка под полем ввода могла уйти из видимой области
+        self.finish_edit()
+        self.v_scrollbar.set(first, last)
 
     def on_mousewheel(self, event):
         """Обрабатывает прокрутку колесиком мыши (вертикальная)."""
-        if event.delta:
-            self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        else:
-            if event.num == 4:
-                self.canvas.yview_scroll(-1, "units")
-            elif event.num == 5:
-                self.canvas.yview_scroll(1, "units")
+        self.queue_scroll(self.wheel_units(event), 0)
+        return "break"
 
     def on_shift_mousewheel(self, event):
         """Обрабатывает горизонтальную прокрутку с Shift+колесико."""
+        self.queue_scroll(0, self.wheel_units(event))
+        return "break"
+
+    @staticmethod
+    def wheel_units(event):
+        """Переводит событие колесика мыши в число единиц прокрутки."""
         if event.delta:
-            self.canvas.xview_scroll(int(-1 * (event.delta / 120)), "units")
-        else:
-            if event.num == 4:
-                self.canvas.xview_scroll(-1, "units")
-            elif event.num == 5:
-                self.canvas.xview_scroll(1, "units")
+            return int(-1 * (event.delta / 120))
+        if event.num == 4:
+            return -1
+        if event.num == 5:
+            return 1
+        return 0
+
+    def queue_scroll(self, dy, dx):
+        """Накапливает прокрутку, чтобы выполнять ее не чаще раза за кадр."""
+        self.wheel_dy += dy
+        self.wheel_dx += dx
+        if self.wheel_after is None:
+            self.wheel_after = self.canvas.after(WHEEL_DEBOUNCE_MS, self.flush_scroll)
+
+    def flush_scroll(self):
+        """Выполняет накопленную прокрутку одним вызовом на каждую ось."""
+        dy, dx = self.wheel_dy, self.wheel_dx
+        self.wheel_dy = self.wheel_dx = 0
+        self.wheel_after = None
+        if dy:
+            self.tree.yview_scroll(dy, "units")
+        if dx:
+            self.canvas.xview_scroll(dx, "units")
 
     def create_table(self, table=None):
         """Создает или пересоздает таблицу переходов."""
+        self.finish_edit()
+
+        # На время перестроения отсоединяем таблицу, чтобы Tk не пересчитывал
+        # геометрию после каждой вставки
+        self.tree.pack_forget()
+
         # Очистка предыдущей таблицы
-        for widget in self.table_frame.winfo_children():
-            widget.destroy()
-
-        self.cells = {}
-
-        # Заголовки символов (горизонтальные)
-        for col, symbol in enumerate(self.symbols):
-            label = ttk.Label(self.table_frame, text=symbol, borderwidth=1, relief="solid",
-                              background="lightgray", width=10)
-            label.grid(row=0, column=col + 1, sticky="nsew", padx=1, pady=1)
-
-        # Состояния и ячейки переходов
-        for row, state in enumerate(self.states):
-            # Заголовок состояния
-            state_label = ttk.Label(self.table_frame, text=state, borderwidth=1, relief="solid",
-                                    background="lightblue", width=8)
-            state_label.grid(row=row + 1, column=0, sticky="nsew", padx=1, pady=1)
-
-            # Ячейки для каждого символа
-            for col, symbol in enumerate(self.symbols):
-                entry = tk.Entry(self.table_frame, width=10, justify='center')
-                entry.grid(row=row + 1, column=col + 1, sticky="nsew", padx=1, pady=1)
-
-                # Заполнение существующих переходов
-                if state in self.machine.states and symbol in self.machine.states[state]:
-                    trans = self.machine.states[state][symbol]
-                    entry.insert(0, f"{trans.write_symbol} {trans.next_state} {trans.direction.value}")
-
-                self.cells[(state, symbol)] = entry
-
-        # Настройка весов строк и столбцов для правильного растягивания
-        for i in range(len(self.states) + 1):
-            self.table_frame.grid_rowconfigure(i, weight=1)
-        for i in range(len(self.symbols) + 1):
-            self.table_frame.grid_columnconfigure(i, weight=1)
-
-        # Обновление области прокрутки
-        self.table_frame.update_idletasks()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self.tree.delete(*self.tree.get_children())
+        self.applied_values = {}
+        self.active_state = None
+
+        # Заголовки символов (столбцы)
+        self.tree.configure(columns=self.symbols)
+        self.fit_tree_height()
+        for symbol in self.symbols:
+            self._build_col(symbol)
+
+        # Состояния и переходы (строки)
+        for state in self.states:
+            self._build_row(state)
+
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        # Обновление области прокрутки (повторные события <Configure> с той же
+        # областью отсекаются в on_frame_configure)
+        self.on_frame_configure(None)
+
+    def _build_row(self, state):
+        """Добавляет в конец таблицы строку переходов для состояния."""
+        row = self.machine.states.get(state, {})
+        values = [row[symbol].to_str() if symbol in row else '' for symbol in self.symbols]
+        self.tree.insert('', 'end', iid=state, text=state, values=values)
+
+        # Запоминаем примененные значения, чтобы не применять их повторно
+        for symbol, value in zip(self.symbols, values):
+            self.applied_values[(state, symbol)] = value
+
+    def _build_col(self, symbol):
+        """Настраивает заголовок и ширину столбца символа."""
+        self.tree.heading(symbol, text=symbol)
+        self.tree.column(symbol, width=80, anchor='center')
+
+    def on_cell_double_click(self, event):
+        """Открывает поле ввода поверх ячейки, по которой дважды щелкнули."""
+        self.finish_edit()
+
+        state = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        if not state or column == '#0':
+            return
+
+        bbox = self.tree.bbox(state, column)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        symbol = self.symbols[int(column[1:]) - 1]
+
+        # Одно поле ввода на всю таблицу, размещается поверх ячейки
+        entry = ttk.Entry(self.tree, justify='center')
+        entry.insert(0, self.tree.set(state, symbol))
+        entry.select_range(0, tk.END)
+        entry.place(x=x, y=y, width=width, height=height)
+        entry.focus_set()
+
+        entry.bind("<Return>", lambda e: self.finish_edit())
+        entry.bind("<FocusOut>", lambda e: self.finish_edit())
+        entry.bind("<Escape>", lambda e: self.finish_edit(save=False))
+        self.cell_editor = (entry, state, symbol)
+
+    def finish_edit(self, save=True):
+        """Закрывает поле ввода ячейки, записывая значение в таблицу."""
+        if self.cell_editor is None:
+            return
+        entry, state, symbol = self.cell_editor
+        self.cell_editor = None
+        if save and self.tree.exists(state):
+            self.tree.set(state, symbol, entry.get().strip())
+        entry.destroy()
 
     def add_state(self):
         """Добавляет новое состояние в таблицу."""
+        from tkinter import simpledialog  # Импорт при первом использовании
         state_name = simpledialog.askstring("Новое состояние", "Введите название для состояния:")
         if not state_name:
             # Генерация имени состояния по умолчанию (q1, q2, ...)
@@ -171,25 +273,40 @@ class TransitionTableEditor:
             new_state = state_name
 
         if new_state not in self.states:
+            self.finish_edit()
             self.states.append(new_state)
-            self.create_table()
+            self._build_row(new_state)
+            self.fit_tree_height()
 
     def add_symbol(self):
         """Добавляет новый символ в таблицу."""
+        from tkinter import simpledialog  # Импорт при первом использовании
         symbol = simpledialog.askstring("Новый символ", "Введите новый символ:")
         if symbol and symbol not in self.symbols:
+            self.finish_edit()
             self.symbols.append(symbol)
-            self.create_table()
+            # Значения строк сохраняются, новый столбец добавляется пустым,
+            # но настройки заголовков сбрасываются при смене списка столбцов
+            self.tree.configure(columns=self.symbols)
+            for column_symbol in self.symbols:
+                self._build_col(column_symbol)
 
     def apply_transitions(self):
         """Применяет изменения из таблицы к машине Тьюринга."""
         try:
-            self.machine.states = {}  # Очистка текущих переходов
+            self.finish_edit()
 
-            for (state, symbol), entry in self.cells.items():
-                value = entry.get().strip()
-                if value:  # Только для непустых ячеек
-                    self.machine.new_transition(state, symbol, value)
+            for state in self.states:
+                for symbol in self.symbols:
+                    value = self.tree.set(state, symbol).strip()
+                    # Применяем только измененные ячейки
+                    if value == self.applied_values.get((state, symbol), ''):
+                        continue
+                    if value:
+                        self.machine.new_transition(state, symbol, value)
+                    else:
+                        self.machine.remove_transition(state, symbol)
+                    self.applied_values[(state, symbol)] = value
 
             messagebox.showinfo("Успех", "Переходы применены!")
 
@@ -198,11 +315,13 @@ class TransitionTableEditor:
 
     def highlight_active_state(self, active_state):
         """Подсвечивает активное состояние в таблице."""
-        for widget in self.table_frame.winfo_children():
-            if isinstance(widget, ttk.Label) and widget.grid_info()["column"] == 0:
-                state_name = widget.cget("text")
-                bg_color = "lightgreen" if state_name == active_state else "lightblue"
-                widget.configure(background=bg_color)
+        if active_state == self.active_state:
+            return
+        if self.active_state is not None and self.tree.exists(self.active_state):
+            self.tree.item(self.active_state, tags=())
+        if self.tree.exists(active_state):
+            self.tree.item(active_state, tags=('active',))
+        self.active_state = active_state
 
 
 class TuringMachineGUI:
@@ -220,6 +339,7 @@ class TuringMachineGUI:
 
         self.setup_ui()
         self.is_running = False
+        self.redraw_pending = False
         self.update_display()
 
     def setup_ui(self):
@@ -248,11 +368,20 @@ class TuringMachineGUI:
         # Canvas для ленты с горизонтальным скроллбаром
         self.tape_canvas = tk.Canvas(tape_container, height=80, bg='white')
         self.tape_scrollbar = ttk.Scrollbar(tape_container, orient="horizontal",
-                                            command=self.tape_canvas.xview)
+                                            command=self.on_tape_xview)
         self.tape_canvas.configure(xscrollcommand=self.tape_scrollbar.set)
 
         self.tape_scrollbar.pack(side="bottom", fill="x")
         self.tape_canvas.pack(side="top", fill="both", expand=True)
+        self.tape_canvas.bind("<Configure>", self.on_tape_configure)
+
+        # Отрисованное состояние ленты для обновления только изменившихся ячеек
+        self.cell_ids = []  # (прямоугольник, текст) для каждой ячейки
+        self.head_arrow_id = None
+        self.drawn_tape = bytearray()  # номера символов, выведенные в ячейках
+        self.drawn_machine = None
+        self.tape_width = 0
+        self.prev_head = None
 
         # Панель управления выполнением
         exec_frame = ttk.Frame(main_frame)
@@ -293,42 +422,97 @@ class TuringMachineGUI:
         self.table_editor = TransitionTableEditor(main_frame, self.machine)
 
     def draw_tape(self, tape, head_pos):
-        """Отрисовывает текущее состояние ленты на canvas."""
+        """Отрисовывает текущее состояние ленты (номера символов) на canvas.
+
+        Полностью лента перерисовывается только при изменении ее длины,
+        иначе обновляются лишь изменившиеся видимые ячейки и положение головки.
+        """
+        cell_width = TAPE_CELL_WIDTH
+        start_x = TAPE_START_X
+
+        # Номера символов имеют смысл только для машины, с которой лента была отрисована
+        if len(tape) != len(self.drawn_tape) or self.machine is not self.drawn_machine:
+            self.redraw_tape(tape, cell_width, start_x)
+            self.drawn_machine = self.machine
+
+        # Перемещение выделения и головки машины
+        if head_pos != self.prev_head:
+            if self.prev_head is not None:
+                self.tape_canvas.itemconfig(self.cell_ids[self.prev_head][0], fill='white')
+            self.tape_canvas.itemconfig(self.cell_ids[head_pos][0], fill='lightblue')
+
+            head_x = start_x + head_pos * cell_width + cell_width / 2
+            self.tape_canvas.coords(self.head_arrow_id,
+                                    head_x - 10, 10, head_x + 10, 10, head_x, 20)
+
+        self.prev_head = head_pos
+
+        # Автоматическая прокрутка к текущей позиции головки
+        self.scroll_to_head(head_pos, cell_width, start_x)
+        self.sync_visible_cells(tape)
+
+    def sync_visible_cells(self, tape):
+        """Обновляет текст изменившихся ячеек ленты в видимой части canvas.
+
+        Ячейки вне видимой области обновляются, когда в нее попадают.
+        """
+        if len(tape) != len(self.drawn_tape) or tape == self.drawn_tape:
+            return
+
+        x0, x1 = self.tape_canvas.xview()
+        first = max(0, int((x0 * self.tape_width - TAPE_START_X) // TAPE_CELL_WIDTH))
+        last = min(len(tape), int((x1 * self.tape_width - TAPE_START_X) // TAPE_CELL_WIDTH) + 1)
+
+        drawn = self.drawn_tape
+        for i in range(first, last):
+            symbol = tape[i]
+            if symbol != drawn[i]:
+                self.tape_canvas.itemconfig(self.cell_ids[i][1], text=self.cell_text(symbol))
+                drawn[i] = symbol
+
+    def on_tape_xview(self, *args):
+        """Прокручивает ленту скроллбаром и дорисовывает открывшиеся ячейки."""
+        self.tape_canvas.xview(*args)
+        self.sync_visible_cells(self.machine.get_state_view().tape)
+
+    def on_tape_configure(self, event):
+        """Дорисовывает ячейки ленты, открывшиеся при изменении размера canvas."""
+        self.sync_visible_cells(self.machine.get_state_view().tape)
+
+    def redraw_tape(self, tape, cell_width, start_x):
+        """Заново создает все элементы ленты на canvas."""
         self.tape_canvas.delete("all")
 
-        cell_width = 50
-        start_x = 50
         total_width = max(800, len(tape) * cell_width + 100)  # Минимальная ширина + запас
 
         # Устанавливаем область прокрутки
         self.tape_canvas.configure(scrollregion=(0, 0, total_width, 80))
+        self.tape_width = total_width
+        self.drawn_tape = bytearray(tape)
 
         # Отрисовка ячеек ленты
+        self.cell_ids = []
         for i, symbol in enumerate(tape):
             x = start_x + i * cell_width
-            if symbol == BLANK_SYMBOL:
-                symbol = ''
-            # Выделение текущей ячейки под головкой
-            if i == head_pos:
-                self.tape_canvas.create_rectangle(x, 20, x + cell_width, 50,
-                                                  fill='lightblue', outline='black')
-            else:
-                self.tape_canvas.create_rectangle(x, 20, x + cell_width, 50,
-                                                  fill='white', outline='black')
-
+            rect_id = self.tape_canvas.create_rectangle(x, 20, x + cell_width, 50,
+                                                        fill='white', outline='black',
+                                                        tags=f"cell{i}")
             # Символ в ячейке
-            self.tape_canvas.create_text(x + cell_width / 2, 35, text=str(symbol),
-                                         font=('Arial', 14))
-
-        # Отрисовка головки машины
-        head_x = start_x + head_pos * cell_width + cell_width / 2
-        self.tape_canvas.create_polygon(
-            head_x - 10, 10, head_x + 10, 10, head_x, 20,
+            text_id = self.tape_canvas.create_text(x + cell_width / 2, 35,
+                                                   text=self.cell_text(symbol),
+                                                   font=('Arial', 14), tags=f"cell{i}")
+            self.cell_ids.append((rect_id, text_id))
+
+        # Головка машины, ее положение задается в draw_tape
+        self.head_arrow_id = self.tape_canvas.create_polygon(
+            0, 0, 0, 0, 0, 0,
             fill='red', outline='black'
         )
+        self.prev_head = None
 
-        # Автоматическая прокрутка к текущей позиции головки
-        self.scroll_to_head(head_pos, cell_width, start_x)
+    def cell_text(self, symbol_id):
+        """Возвращает текст ячейки ленты (пустая ячейка не подписывается)."""
+        return '' if symbol_id == BLANK_BYTE else self.machine.get_symbol(symbol_id)
 
     def scroll_to_head(self, head_pos, cell_width, start_x):
         """Прокручивает ленту к текущей позиции головки."""
@@ -351,17 +535,31 @@ class TuringMachineGUI:
 
     def update_display(self):
         """Обновляет все элементы отображения состояния машины."""
-        info: StateInfo = self.machine.get_state_info()
+        info: StateView = self.machine.get_state_view()
         self.state_label.config(text=f"State: {info.current_state}")
         self.step_label.config(text=f"Steps_done: {info.step_count}")
         self.draw_tape(info.tape, info.head_position)
         self.table_editor.highlight_active_state(info.current_state)
 
+    def request_redraw(self):
+        """Планирует обновление отображения на момент простоя цикла событий.
+
+        Несколько запросов до перерисовки объединяются в одну.
+        """
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.do_redraw)
+
+    def do_redraw(self):
+        """Выполняет запланированное обновление отображения."""
+        self.redraw_pending = False
+        self.update_display()
+
     def step(self):
         """Выполняет один шаг машины Тьюринга."""
         try:
             if self.machine.run_transition():
-                self.update_display()
+                self.request_redraw()
             else:
                 messagebox.showinfo("Done", "Machine successfully stopped!")
                 self.is_running = False
@@ -373,7 +571,7 @@ class TuringMachineGUI:
         self.is_running = False
         try:
             if self.machine.step_back():
-                self.update_display()
+                self.request_redraw()
             else:
                 messagebox.showinfo("Невозможно", "Никаких шагов ранее не было!")
         except Exception as e:
@@ -388,17 +586,25 @@ class TuringMachineGUI:
             self.is_running = False
 
     def auto_run(self):
-        """Автоматически выполняет шаги машины с заданной скоростью."""
+        """Автоматически выполняет шаги машины с заданной скоростью.
+
+        За один тик выполняется пачка из speed^2 шагов, а отображение
+        обновляется один раз в конце пачки.
+        """
         if self.is_running:
             try:
-                if self.machine.run_transition():
-                    self.update_display()
-                    speed = int(self.speed.get()) if self.speed.get() else 3
+                speed = int(self.speed.get()) if self.speed.get() else 3
+                for _ in range(max(1, speed * speed)):
+                    if not self.machine.run_transition():
+                        self.is_running = False
+                        break
+                self.request_redraw()
+                if self.is_running:
                     self.root.after(2100 - 400 * speed, self.auto_run)
                 else:
                     messagebox.showinfo("Done", "Machine successfulle stoped!")
-                    self.is_running = False
             except Exception as e:
+                self.request_redraw()
                 messagebox.showerror("Error", str(e))
                 self.is_running = False
 
@@ -445,10 +651,11 @@ class TuringMachineGUI:
 
     def save_machine(self):
         """Сохраняет текущую программу машины в файл."""
+        from tkinter import filedialog  # Импорт при первом использовании
         filename = filedialog.asksaveasfilename(
             title="Сохранить программу",
             defaultextension=".tur",
-            filetypes=[("Turing machine files", "*.tur"), ("All files", "*.*")],
+            filetypes=PROGRAM_FILETYPES,
             initialdir=os.getcwd()
         )
 
@@ -456,7 +663,10 @@ class TuringMachineGUI:
             return
 
         try:
-            self.machine.save_to_file(filename)
+            if filename.endswith(BINARY_PROGRAM_EXT):
+                self.machine.save_to_file_bin(filename)
+            else:
+                self.machine.save_to_file(filename)
             messagebox.showinfo("Success", f"Программа сохранена в файл:\n{filename}")
         except Exception as e:
             messagebox.showerror("Error", f"Не удалось сохранить файл:\n{str(e)}")
@@ -467,9 +677,10 @@ class TuringMachineGUI:
 
     def load_machine(self):
         """Загружает программу машины из файла."""
+        from tkinter import filedialog  # Импорт при первом использовании
         filename = filedialog.askopenfilename(
             title="Загрузить программу",
-            filetypes=[("Turing machine files", "*.tur"), ("All files", "*.*")],
+            filetypes=PROGRAM_FILETYPES,
             initialdir=os.getcwd()
         )
 
@@ -477,7 +688,10 @@ class TuringMachineGUI:
             return
 
         try:
-            self.machine = TuringMachine.load_from_file(filename)
+            if filename.endswith(BINARY_PROGRAM_EXT):
+                self.machine = TuringMachine.load_from_file_bin(filename)
+            else:
+                self.machine = TuringMachine.load_from_file(filename)
 
             # Обновление редактора таблицы
             self.table_editor.machine = self.machine
@@ -9,8 +9,24 @@
 - Валидации переходов
 """
 
-from constants import *
+from constants import (BLANK_SYMBOL, BLANK_BYTE, LEFT_END, MAX_HISTORY_LEN, MAX_SYMBOLS,
+                       VALID_DIRECTION_CHARS, Transition, TransitionParser, StateInfo, StateView,
+                       TransitionDelta)
+from collections import deque
+import bisect
 import json
+import pickle
+import sys
+import tm_core
+
+
+def _symbol_sort_key(symbol: str) -> tuple:
+    """Ключ сортировки символов: пустой символ первым, остальные по кодам символов.
+
+    Для односимвольных строк порядок совпадает с порядком по ord, но ключ
+    определен и для символов из нескольких знаков.
+    """
+    return (0, '') if symbol == BLANK_SYMBOL else (1, symbol)
 
 
 class TuringMachineError(Exception):
@@ -38,33 +54,111 @@ class InvalidTransitionError(TuringMachineError):
     def __init__(self, state, symbol):
         super().__init__(f"Некорректная инструкция для состояния {state} символа {symbol}. "
                          f"\nФормат правильной инструкции: <новый символ> <состояние> <направление>"
-                         f"\nГде направление - один из символов {Direction.ALL.value}")
+                         f"\nГде направление - один из символов {list(VALID_DIRECTION_CHARS)}")
+
+
+class TooManySymbolsError(TuringMachineError):
+    """Исключение при превышении допустимого числа различных символов ленты."""
+
+    def __init__(self):
+        super().__init__(f"Лента поддерживает не более {MAX_SYMBOLS} различных символов")
+
+
+class Alphabet:
+    """Алфавит ленты: сопоставляет каждому символу номер, помещающийся в байт.
+
+    Пустой символ всегда имеет номер BLANK_BYTE. Выданные номера не меняются,
+    поэтому лента из номеров остается корректной при добавлении новых символов.
+    """
+
+    def __init__(self, symbols: list = ()):
+        """Создает алфавит, регистрируя символы в указанном порядке после пустого."""
+        self._ids: dict = {BLANK_SYMBOL: BLANK_BYTE}  # символ -> номер
+        self.symbols: list = [BLANK_SYMBOL]  # номер -> символ
+        for symbol in symbols:
+            self.id_of(symbol)
+
+    def __contains__(self, symbol: str):
+        """Проверяет, зарегистрирован ли символ в алфавите."""
+        return symbol in self._ids
+
+    def id_of(self, symbol: str) -> int:
+        """Возвращает номер символа, регистрируя новый символ при необходимости.
+
+        Raises:
+            TooManySymbolsError: если символов больше, чем помещается в байт
+        """
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            if len(self.symbols) == MAX_SYMBOLS:
+                raise TooManySymbolsError()
+            symbol_id = len(self.symbols)
+            self._ids[symbol] = symbol_id
+            self.symbols.append(symbol)
+        return symbol_id
+
+    def check_room(self, *symbols):
+        """Проверяет, что новые символы поместятся в алфавит, не регистрируя их.
+
+        Raises:
+            TooManySymbolsError: если символов больше, чем помещается в байт
+        """
+        new_symbols = {symbol for symbol in symbols if symbol not in self._ids}
+        if len(self.symbols) + len(new_symbols) > MAX_SYMBOLS:
+            raise TooManySymbolsError()
+
+    def symbol_of(self, symbol_id: int) -> str:
+        """Возвращает символ по его номеру."""
+        return self.symbols[symbol_id]
+
+    def encode(self, symbols: list) -> bytearray:
+        """Переводит список символов в массив номеров."""
+        return bytearray(self.id_of(symbol) for symbol in symbols)
+
+    def decode(self, tape) -> list:
+        """Переводит массив номеров в список символов."""
+        symbols = self.symbols
+        return [symbols[symbol_id] for symbol_id in tape]
 
 
 class TuringMachine:
     """Основной класс, реализующий машину Тьюринга.
 
     Атрибуты:
-        current_state: текущее состояние управления
+        current_state: текущее состояние управления (всегда интернированная строка)
         states: словарь переходов (state -> symbol -> Transition)
-        tape: лента, представленная списком символов
-        head_position: текущая позиция головки (0-based индекс)
+        tape: лента - представление (memoryview) номеров символов без копирования
+        head_position: текущая позиция головки (0-based индекс на ленте)
         step_count: счетчик выполненных шагов
         saved_state: сохраненное состояние для восстановления
         symbols: множество используемых символов
-        history: история состояний для реализации отката
+        history: история изменений (TransitionDelta) для реализации отката
     """
 
     def __init__(self):
         """Инициализация машины Тьюринга с начальными значениями."""
         self.current_state: str = 'q0'
         self.states: dict = {'q0': {}}  # state -> symbol -> Transition
-        self.tape: list = [BLANK_SYMBOL]
+        self._alphabet = Alphabet()  # символ <-> номер на ленте
+        self._parser = TransitionParser()  # общие объекты Transition для одинаковых инструкций
+        # Плоская таблица переходов, строится лениво в _compile
+        self._dispatch: list = None
+        self._state_names: list = []  # номер состояния -> имя
+        self._state_ids: dict = {}  # имя -> номер состояния
+        self._current_base: int = 0  # номер текущего состояния * MAX_SYMBOLS
+        self._core_table = None  # упакованная таблица переходов для tm_core
+        # Лента хранится в буфере с пустым запасом с обеих сторон: занятая часть -
+        # _cells[_origin:_end], поэтому расширение в любую сторону в среднем O(1)
+        self._cells: bytearray = bytearray([BLANK_BYTE])
+        self._origin: int = 0  # индекс первой ячейки ленты в буфере
+        self._end: int = 1  # индекс буфера после последней ячейки ленты
         self.head_position: int = LEFT_END
         self.step_count: int = 0
         self.saved_state: StateInfo = None
         self.symbols = {BLANK_SYMBOL}
-        self.history = []
+        self._symbols_sorted: list = [BLANK_SYMBOL]  # символы в порядке get_symbols
+        self._symbol_keys: list = [_symbol_sort_key(BLANK_SYMBOL)]  # ключи сортировки символов
+        self.history = deque(maxlen=MAX_HISTORY_LEN)
 
     def new_transition(self, state: str, symbol: str, instruction: str):
         """Добавляет или заменяет переход в таблице переходов.
@@ -76,42 +170,155 @@ class TuringMachine:
 
         Raises:
             InvalidTransitionError: если инструкция имеет некорректный формат
+            TooManySymbolsError: если символов больше, чем помещается в байт
         """
         try:
-            transition = Transition.from_str(instruction)
-            self.states.setdefault(state, {})[symbol] = transition
-            self.symbols.add(symbol)
+            transition = self._parser.parse(instruction)
         except Exception as e:
             raise InvalidTransitionError(state, symbol)
 
+        self._add_transition(state, symbol, transition)
+
+    def _add_transition(self, state: str, symbol: str, transition: Transition):
+        """Добавляет уже разобранный переход в таблицу переходов.
+
+        Все проверки выполняются до изменения таблицы, поэтому при ошибке
+        машина остается в прежнем состоянии.
+        """
+        # Ключи таблицы интернируются так же, как поля Transition
+        state = sys.intern(state)
+        symbol = sys.intern(symbol)
+        self._dispatch = None
+        self._alphabet.check_room(symbol, transition.write_symbol)
+
+        self._alphabet.id_of(symbol)
+        self._alphabet.id_of(transition.write_symbol)
+        self.states.setdefault(state, {})[symbol] = transition
+        if symbol not in self.symbols:
+            self.symbols.add(symbol)
+            key = _symbol_sort_key(symbol)
+            index = bisect.bisect(self._symbol_keys, key)
+            self._symbol_keys.insert(index, key)
+            self._symbols_sorted.insert(index, symbol)
+
+    def remove_transition(self, state: str, symbol: str):
+        """Удаляет переход из таблицы переходов, если он существует.
+
+        Args:
+            state: исходное состояние
+            symbol: читаемый символ
+        """
+        self.states.get(state, {}).pop(symbol, None)
+        self._dispatch = None
+
+    def _compile(self):
+        """Строит плоскую таблицу переходов для выполнения программы.
+
+        Переход для состояния с номером i и символа с номером c хранится по
+        индексу i * MAX_SYMBOLS + c в виде кортежа (i' * MAX_SYMBOLS, номер
+        записываемого символа, смещение головки, признак остановки, Transition),
+        где i' - номер следующего состояния или -1, если такого состояния нет.
+        """
+        state_names = list(self.states)
+        state_ids = {state: i for i, state in enumerate(state_names)}
+        id_of = self._alphabet.id_of
+
+        dispatch = [None] * (len(state_names) * MAX_SYMBOLS)
+        for state, row in self.states.items():
+            base = state_ids[state] * MAX_SYMBOLS
+            for symbol, transition in row.items():
+                next_id = state_ids.get(transition.next_state)
+                next_base = -1 if next_id is None else next_id * MAX_SYMBOLS
+                dispatch[base + id_of(symbol)] = (next_base, id_of(transition.write_symbol),
+                                                  transition.direction.delta, transition.halting,
+                                                  transition)
+
+        self._dispatch = dispatch
+        self._core_table = None
+        self._state_names = state_names
+        self._state_ids = state_ids
+        self._current_base = state_ids[self.current_state] * MAX_SYMBOLS
+        return dispatch
+
     def set_tape(self, s: list):
         """Устанавливает новое содержимое ленты.
 
         Args:
             s: список символов для ленты
         """
-        self.tape = s or [BLANK_SYMBOL]
-        self.current_state = 'q0'
+        self.tape = self._alphabet.encode(s or [BLANK_SYMBOL])
+        self._set_state('q0')
         self.head_position = LEFT_END
+        self.history.clear()  # Изменения старой ленты нельзя откатить на новой
 
-    def _move_head(self, direction: Direction):
-        """Перемещает головку в заданном направлении, расширяя ленту при необходимости."""
-        self.head_position += direction.to_int
+    def _move_head(self, offset: int):
+        """Перемещает головку на offset ячеек (-1, 0, 1), расширяя ленту при необходимости.
+
+        Returns:
+            -1 если лента расширена влево, 1 если вправо, иначе 0
+        """
+        self.head_position += offset
 
-        # Расширение ленты влево при достижении начала
+        # Расширение ленты влево: занимаем ячейку из запаса слева
         if self.head_position == -1:
-            self.tape.insert(0, BLANK_SYMBOL)
+            if self._origin == 0:
+                shift = self._grow_left()
+                self._origin += shift
+                self._end += shift
+            self._origin -= 1
             self.head_position = LEFT_END
+            return -1
+
+        # Расширение ленты вправо: занимаем ячейку из запаса справа
+        if self.head_position == self._end - self._origin:
+            if self._end == len(self._cells):
+                self._grow_right()
+            self._end += 1
+            return 1
+
+        return 0
+
+    def _grow_left(self) -> int:
+        """Добавляет слева от буфера ленты пустой запас размером с сам буфер.
+
+        Буфер не расширяется на месте, а заменяется новым, поэтому ранее
+        выданные представления ленты (memoryview) не мешают расширению.
 
-        # Расширение ленты вправо при достижении конца
-        if self.head_position == len(self.tape):
-            self.tape.append(BLANK_SYMBOL)
+        Returns:
+            Число добавленных ячеек, на которое сдвигаются все индексы буфера
+        """
+        cells = self._cells
+        shift = len(cells)
+        self._cells = bytearray([BLANK_BYTE]) * shift + cells
+        return shift
+
+    def _grow_right(self):
+        """Добавляет справа от буфера ленты пустой запас размером с сам буфер."""
+        cells = self._cells
+        self._cells = cells + bytearray([BLANK_BYTE]) * len(cells)
+
+    @property
+    def tape(self) -> memoryview:
+        """Лента: представление занятой части буфера без копирования.
+
+        После расширения ленты представление устаревает, его нужно получить заново.
+        """
+        return memoryview(self._cells)[self._origin:self._end]
+
+    @tape.setter
+    def tape(self, cells):
+        """Заменяет ленту копией массива номеров символов."""
+        self._cells = bytearray(cells)
+        self._origin = 0
+        self._end = len(self._cells)
 
     def _set_state(self, state: str):
         """Устанавливает новое состояние машины с проверкой его существования."""
         if state not in self.states:
             raise InvalidStateError(state)
         self.current_state = state
+        if self._dispatch is not None:
+            self._current_base = self._state_ids[state] * MAX_SYMBOLS
 
     def run_transition(self):
         """Выполняет один шаг машины Тьюринга.
@@ -121,28 +328,39 @@ class TuringMachine:
 
         Raises:
             NoTransitionError: если нет перехода для текущего символа
+            InvalidStateError: при переходе в несуществующее состояние
         """
-        symbol = self.current_symbol
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._compile()
+
+        cells = self._cells
+        pos = self._origin + self.head_position
+        symbol_id = cells[pos]
+        entry = dispatch[self._current_base + symbol_id]
 
-        if symbol not in self.states[self.current_state]:
-            raise NoTransitionError(symbol)
+        if entry is None:
+            raise NoTransitionError(self._alphabet.symbol_of(symbol_id))
 
-        # Сохраняем текущее состояние в истории
-        self.history.append(self.get_state_info())
-        if len(self.history) > MAX_HISTORY_LEN:
-            self.history.pop(0)
+        next_base, write_id, offset, halting, instruction = entry
+        if next_base < 0:
+            raise InvalidStateError(instruction.next_state)
+
+        # Запоминаем изменения шага для отката (старейшие записи вытесняются deque)
+        delta = TransitionDelta(self.head_position, symbol_id, self.current_state, 0)
 
         # Выполняем инструкцию перехода
-        instruction: Transition = self.states[self.current_state][symbol]
-        self.tape[self.head_position] = instruction.write_symbol
-        self._set_state(instruction.next_state)
+        self.current_state = instruction.next_state
+        self._current_base = next_base
+        cells[pos] = write_id
         self.step_count += 1
+        self.history.append(delta)
 
         # Проверяем не является ли переход остановочным
-        if instruction.direction == Direction.STOP:
+        if halting:
             return 0
 
-        self._move_head(instruction.direction)
+        delta.tape_growth = self._move_head(offset)
         return 1
 
     def run(self):
@@ -150,19 +368,149 @@ class TuringMachine:
         while self.run_transition():
             pass
 
+    def run_fast(self, max_steps: int = 10 ** 7):
+        """Быстро выполняет программу до остановки машины без записи истории.
+
+        Все поля машины вынесены в локальные переменные цикла. Если установлен
+        numba, выполнение передаётся скомпилированному ядру tm_core. Откат через
+        выполненные здесь шаги невозможен, поэтому история очищается.
+
+        Args:
+            max_steps: максимальное число выполняемых шагов
+
+        Returns:
+            0 если машина остановилась, 1 если достигнут предел шагов
+
+        Raises:
+            NoTransitionError: если нет перехода для текущего символа
+            InvalidStateError: при переходе в несуществующее состояние
+        """
+        if tm_core.NUMBA_AVAILABLE:
+            return self._run_core(max_steps)
+
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._compile()
+
+        cells = self._cells
+        origin = self._origin
+        end = self._end
+        base = self._current_base
+        pos = origin + self.head_position
+        steps = 0
+
+        try:
+            while steps < max_steps:
+                symbol_id = cells[pos]
+                entry = dispatch[base + symbol_id]
+                if entry is None:
+                    raise NoTransitionError(self._alphabet.symbol_of(symbol_id))
+
+                next_base, write_id, offset, halting, instruction = entry
+                if next_base < 0:
+                    raise InvalidStateError(instruction.next_state)
+                cells[pos] = write_id
+                base = next_base
+                steps += 1
+
+                if halting:
+                    return 0
+
+                pos += offset
+                if pos < origin:
+                    origin = pos
+                    if pos < 0:
+                        shift = self._grow_left()
+                        cells = self._cells
+                        pos += shift
+                        origin += shift
+                        end += shift
+                elif pos == end:
+                    end += 1
+                    if end > len(cells):
+                        self._grow_right()
+                        cells = self._cells
+            return 1
+        finally:
+            self.current_state = self._state_names[base // MAX_SYMBOLS]
+            self._current_base = base
+            self._origin = origin
+            self._end = end
+            self.head_position = pos - origin
+            self.step_count += steps
+            self.history.clear()
+
+    def _run_core(self, max_steps: int):
+        """Выполняет run_fast через ядро tm_core, выделяя новый запас ленты между вызовами."""
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._compile()
+        table = self._core_table
+        if table is None:
+            table = self._core_table = tm_core.build_table(dispatch)
+
+        cells = self._cells
+        origin = self._origin
+        end = self._end
+        base = self._current_base
+        pos = origin + self.head_position
+        steps = 0
+
+        try:
+            while True:
+                status, base, pos, done, origin, end = tm_core.run(
+                    cells, pos, base, table, max_steps - steps, origin, end)
+                steps += done
+                # Ядро возвращается на край буфера, только когда исчерпан запас
+                if status == tm_core.LEFT_EDGE:
+                    shift = self._grow_left()
+                    cells = self._cells
+                    pos += shift
+                    origin += shift
+                    end += shift
+                elif status == tm_core.RIGHT_EDGE:
+                    self._grow_right()
+                    cells = self._cells
+                elif status == tm_core.NO_TRANSITION:
+                    raise NoTransitionError(self._alphabet.symbol_of(cells[pos]))
+                elif status == tm_core.INVALID_STATE:
+                    raise InvalidStateError(dispatch[base + cells[pos]][-1].next_state)
+                else:
+                    return status
+        finally:
+            self.current_state = self._state_names[base // MAX_SYMBOLS]
+            self._current_base = base
+            self._origin = origin
+            self._end = end
+            self.head_position = pos - origin
+            self.step_count += steps
+            self.history.clear()
+
     def get_state_info(self):
-        """Возвращает объект StateInfo с текущим состоянием машины."""
+        """Возвращает снимок StateInfo текущего состояния машины с копией ленты."""
         return StateInfo(
             self.current_state,
             self.head_position,
-            self.tape.copy(),
+            self.tape.tobytes(),
+            self.step_count
+        )
+
+    def get_state_view(self):
+        """Возвращает StateView текущего состояния машины без копирования ленты.
+
+        Лента в StateView - сама лента машины, она изменится при следующих шагах.
+        """
+        return StateView(
+            self.current_state,
+            self.head_position,
+            self.tape,
             self.step_count
         )
 
     def save_to_file(self, filename: str):
         """Сохраняет текущую конфигурацию машины в JSON файл."""
         data = {
-            'tape': self.tape,
+            'tape': self._alphabet.decode(self.tape),
             'states': {
                 state_name: {
                     symbol: transition.to_str() for symbol, transition in state.items()
@@ -181,10 +529,59 @@ class TuringMachine:
         machine = cls()
         machine.set_tape(data['tape'])
 
-        # Восстанавливаем таблицу переходов
-        for state_name, state in data['states'].items():
+        # Восстанавливаем таблицу переходов, разбирая все инструкции за один проход
+        cells = [(state_name, symbol, instruction)
+                 for state_name, state in data['states'].items()
+                 for symbol, instruction in state.items()]
+        # Общий разбор сопоставляет строки ячейкам, только если каждая ячейка - ровно одна строка
+        transitions = None
+        if all(isinstance(instruction, str) and len(instruction.strip().splitlines()) == 1
+               for _, _, instruction in cells):
+            try:
+                transitions = machine._parser.parse_many('\n'.join(cell[2] for cell in cells))
+            except ValueError:
+                pass
+
+        if transitions is not None and len(transitions) == len(cells):
+            for (state_name, symbol, _), transition in zip(cells, transitions):
+                machine._add_transition(state_name, symbol, transition)
+        else:
+            # Разбор по одной инструкции укажет на некорректную ячейку
+            for state_name, symbol, instruction in cells:
+                machine.new_transition(state_name, symbol, instruction)
+
+        return machine
+
+    def save_to_file_bin(self, filename: str):
+        """Сохраняет текущую конфигурацию машины в двоичный файл (pickle).
+
+        Лента сохраняется массивом номеров символов, а переходы - готовыми
+        объектами Transition, поэтому при загрузке строки не разбираются заново.
+        """
+        data = (bytes(self.tape), self._alphabet.symbols, self.states)
+        with open(filename, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load_from_file_bin(cls, filename: str):
+        """Загружает конфигурацию машины из двоичного файла.
+
+        Файл разбирается через pickle, поэтому загружать можно только
+        файлы из доверенных источников.
+        """
+        with open(filename, 'rb') as f:
+            tape, id_symbols, states = pickle.load(f)
+
+        machine = cls()
+
+        # Символы регистрируются в сохраненном порядке, чтобы номера на ленте совпали
+        machine._alphabet = Alphabet(id_symbols[1:])
+        machine.tape = tape
+
+        # Восстанавливаем таблицу переходов через общие объекты Transition машины
+        for state_name, state in states.items():
             for symbol, transition in state.items():
-                machine.new_transition(state_name, symbol, transition)
+                machine._add_transition(state_name, symbol, machine._parser.share(transition))
 
         return machine
 
@@ -196,13 +593,18 @@ class TuringMachine:
         """Восстанавливает ранее сохраненное состояние ленты."""
         if self.saved_state:
             self.head_position = self.saved_state.head_position
-            self.tape = self.saved_state.tape.copy()
-            self.current_state = self.saved_state.current_state
+            self.tape = self.saved_state.tape
+            self._set_state(self.saved_state.current_state)
             self.step_count = self.saved_state.step_count
+            self.history.clear()
+
+    def get_symbol(self, symbol_id: int) -> str:
+        """Возвращает символ по его номеру на ленте."""
+        return self._alphabet.symbol_of(symbol_id)
 
     def get_symbols(self):
         """Возвращает отсортированный список всех используемых символов."""
-        return sorted(self.symbols, key=lambda x: ord(x) if x != '_' else -1)
+        return self._symbols_sorted.copy()
 
     def get_states(self):
         """Возвращает список всех состояний машины."""
@@ -215,15 +617,25 @@ class TuringMachine:
             1 если откат выполнен, 0 если история пуста
         """
         if self.history:
-            prev: StateInfo = self.history.pop()
-            self.head_position = prev.head_position
-            self.tape = prev.tape.copy()
-            self.current_state = prev.current_state
-            self.step_count = prev.step_count
+            delta: TransitionDelta = self.history.pop()
+
+            # Возвращаем в запас ячейку, добавленную при движении головки
+            # (запас буфера всегда заполнен пустыми символами)
+            if delta.tape_growth < 0:
+                self._cells[self._origin] = BLANK_BYTE
+                self._origin += 1
+            elif delta.tape_growth > 0:
+                self._end -= 1
+                self._cells[self._end] = BLANK_BYTE
+
+            self.head_position = delta.head_position
+            self._cells[self._origin + self.head_position] = delta.overwritten_symbol
+            self._set_state(delta.prev_state)
+            self.step_count -= 1
             return 1
         return 0
 
     @property
     def current_symbol(self):
         """Возвращает символ под текущей позицией головки."""
-        return self.tape[self.head_position]
\ No newline at end of file
+        return self._alphabet.symbol_of(self._cells[self._origin + self.head_position])
\ No newline at end of file
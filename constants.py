@@ -5,21 +5,32 @@
 Содержит:
 - Исключения для обработки ошибок машины Тьюринга
 - Перечисление направлений движения головки
-- Классы для представления переходов и состояния машины
+- Классы для представления переходов, состояния машины и истории шагов
 - Базовые константы
 """
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import List
+from typing import Final
+import re
+import sys
+
+# Символы допустимых направлений в порядке объявления членов Direction
+VALID_DIRECTION_CHARS: Final[tuple] = ('<', '>', '!', '.')
 
 
 class InvalidDirectionError(Exception):
     """Исключение при указании недопустимого направления движения."""
 
     def __init__(self, direction=''):
-        super().__init__(f"""Направления {direction} не может существовать! 
-        Допустимые направления: {Direction.ALL.value}""")
+        # direction попадает в args, поэтому сохраняется при pickle и copy
+        super().__init__(direction)
+        self.direction = direction
+
+    def __str__(self):
+        # Сообщение собирается только при выводе, а не при каждом создании исключения
+        return f"""Направления {self.direction} не может существовать! 
+        Допустимые направления: {list(VALID_DIRECTION_CHARS)}"""
 
 
 class Direction(Enum):
@@ -29,61 +40,205 @@ class Direction(Enum):
     RIGHT = '>'
     STOP = '!'
     STAY = '.'
-    ALL = [LEFT, RIGHT, STOP, STAY]
-    _VALUE_INT_MAPPING = {LEFT: -1, RIGHT: 1, STAY: 0, STOP: 0}
 
-    @property
-    def to_int(self):
-        """Возвращает числовое представление направления (-1, 0, 1)."""
-        return Direction._VALUE_INT_MAPPING.value[self.value]
 
+# Смещение головки (-1, 0, 1) хранится обычным атрибутом члена, а не свойством
+Direction.LEFT.delta = -1
+Direction.RIGHT.delta = 1
+Direction.STOP.delta = 0
+Direction.STAY.delta = 0
 
-@dataclass
+# Символ направления -> член Direction (без поиска по значению в Direction.__call__)
+_CHAR_TO_DIR = {direction.value: direction for direction in Direction}
+Direction.all_chars = frozenset(VALID_DIRECTION_CHARS)
+
+# Одна инструкция перехода на строку: <символ> <состояние> <направление>
+_TRANSITION_RE = re.compile(r'^[ \t]*(\S+)[ \t]+(\S+)[ \t]+([<>!.])[ \t\r]*$', re.M)
+
+
+@dataclass(frozen=True)
 class Transition:
     """Класс, представляющий переход машины Тьюринга.
 
+    Объекты неизменяемы и хранят поля в __slots__, поэтому занимают меньше
+    памяти и могут разделяться между ячейками таблицы.
+
     Атрибуты:
         next_state: следующее состояние
         write_symbol: символ для записи на ленту
         direction: направление движения головки
+        halting: True, если переход останавливает машину (направление STOP)
     """
 
+    __slots__ = ('next_state', 'write_symbol', 'direction', '_dir_char', 'halting')
+
     next_state: str
     write_symbol: str
     direction: Direction
 
+    def __post_init__(self):
+        # Имена состояний и символы интернируются при любом способе создания
+        # (разбор строки, pickle), чтобы их сравнение при поиске в таблице
+        # переходов сводилось к сравнению указателей
+        object.__setattr__(self, 'next_state', sys.intern(self.next_state))
+        object.__setattr__(self, 'write_symbol', sys.intern(self.write_symbol))
+        # Символ направления запоминается, чтобы to_str не обращался к Enum.value
+        object.__setattr__(self, '_dir_char', self.direction.value)
+        # Остановка - признак управления, а не смещение головки
+        object.__setattr__(self, 'halting', self.direction is Direction.STOP)
+
+    def __reduce__(self):
+        """Поддержка pickle: неизменяемый объект со __slots__ создается через конструктор."""
+        return self.__class__, (self.next_state, self.write_symbol, self.direction)
+
     def to_str(self):
         """Преобразует переход в строковое представление."""
-        return f'{self.write_symbol} {self.next_state} {self.direction.value}'
+        return f'{self.write_symbol} {self.next_state} {self._dir_char}'
+
+    @staticmethod
+    def dump_many(transitions) -> str:
+        """Преобразует переходы в текст с одной инструкцией на строку (обратно parse_many)."""
+        return '\n'.join([transition.to_str() for transition in transitions])
 
     @classmethod
     def from_str(cls, data: str):
         """Создает объект Transition из строки."""
-        symbol, state, direction = data.strip().split()
-        if direction not in Direction.ALL.value:
-            raise InvalidDirectionError
-        direction = Direction(direction)
+        symbol, state, direction_char = data.strip().split()
+        direction = _CHAR_TO_DIR.get(direction_char)
+        if direction is None:
+            raise InvalidDirectionError(direction_char)
         return cls(
             next_state=state,
             write_symbol=symbol,
             direction=direction
         )
 
+    @classmethod
+    def parse_many(cls, text: str):
+        """Создает список объектов Transition из текста с одной инструкцией на каждой строке.
+
+        Все строки разбираются одним проходом скомпилированного регулярного выражения.
+        Пустые строки пропускаются, окончания строк \r\n допускаются.
+
+        Raises:
+            ValueError: если какая-либо строка не является корректной инструкцией
+        """
+        if not text:
+            return []
+        char_to_dir = _CHAR_TO_DIR
+        transitions = [cls(state, symbol, char_to_dir[direction])
+                       for symbol, state, direction in _TRANSITION_RE.findall(text)]
+
+        # Каждая непустая строка дает не больше одного совпадения, поэтому совпадений
+        # меньше, чем непустых строк, только если есть некорректная строка
+        if len(transitions) != sum(1 for line in text.splitlines() if line.strip()):
+            raise ValueError("Текст содержит некорректные инструкции перехода")
+        return transitions
+
+
+class TransitionParser:
+    """Разбирает инструкции переходов, переиспользуя уже созданные объекты Transition.
+
+    Одинаковые инструкции (с точностью до пробелов) дают один и тот же объект,
+    поэтому таблица переходов хранит только различные переходы. Объекты Transition
+    неизменяемы, и их можно разделять между ячейками таблицы.
+    """
 
-@dataclass
+    def __init__(self):
+        self._cache: dict = {}  # (символ, состояние, направление) -> Transition
+
+    def parse(self, line: str) -> Transition:
+        """Разбирает одну инструкцию, как Transition.from_str."""
+        key = tuple(line.split())
+        transition = self._cache.get(key)
+        if transition is None:
+            transition = Transition.from_str(line)
+            self._cache[key] = transition
+        return transition
+
+    def parse_many(self, text: str) -> list:
+        """Разбирает текст с одной инструкцией на строку, как Transition.parse_many.
+
+        Raises:
+            ValueError: если какая-либо строка не является корректной инструкцией
+        """
+        return [self.share(transition) for transition in Transition.parse_many(text)]
+
+    def share(self, transition: Transition) -> Transition:
+        """Возвращает общий объект для перехода, созданного не через parse (например, из pickle)."""
+        key = (transition.write_symbol, transition.next_state, transition._dir_char)
+        return self._cache.setdefault(key, transition)
+
+
+@dataclass(frozen=True)
 class StateInfo:
     """Класс для хранения полного состояния машины Тьюринга в определенный момент.
 
-    Используется для отката изменений и отображения истории.
+    Используется для сохранения ленты. Лента хранится неизменяемой копией
+    номеров символов (см. TuringMachine.get_symbol), поэтому объекты можно
+    сравнивать и хешировать.
     """
 
+    __slots__ = ('current_state', 'head_position', 'tape', 'step_count')
+
     current_state: str
     head_position: int
-    tape: List[str]
+    tape: bytes
     step_count: int
 
+    def __reduce__(self):
+        """Поддержка pickle и copy: неизменяемый объект со __slots__ создается через конструктор."""
+        return self.__class__, (self.current_state, self.head_position, self.tape, self.step_count)
+
+
+@dataclass(frozen=True, eq=False)
+class StateView:
+    """Класс для отображения текущего состояния машины без копирования ленты.
+
+    Поля совпадают со StateInfo, но tape - представление (memoryview) ленты
+    машины, которое изменится при следующих шагах. Поэтому объекты сравниваются
+    и хешируются по идентичности, а не по значению.
+    """
+
+    __slots__ = ('current_state', 'head_position', 'tape', 'step_count')
+
+    current_state: str
+    head_position: int
+    tape: memoryview
+    step_count: int
+
+    def __reduce__(self):
+        """Поддержка pickle и copy: копия содержит отдельную копию ленты."""
+        return self.__class__, (self.current_state, self.head_position,
+                                bytearray(self.tape), self.step_count)
+
+
+@dataclass
+class TransitionDelta:
+    """Класс для хранения изменений, внесенных одним шагом машины Тьюринга.
+
+    Используется для отката шага вместо хранения полной копии ленты.
+    Каждый шаг увеличивает счетчик шагов на 1, поэтому при откате
+    счетчик просто уменьшается.
+
+    Атрибуты:
+        head_position: позиция головки до шага
+        overwritten_symbol: номер символа, перезаписанного на ленте
+        prev_state: состояние до шага
+        tape_growth: -1 если лента расширилась влево, 1 если вправо, иначе 0
+    """
+
+    __slots__ = ('head_position', 'overwritten_symbol', 'prev_state', 'tape_growth')
+
+    head_position: int
+    overwritten_symbol: int
+    prev_state: str
+    tape_growth: int
+
 
 # Базовые константы машины Тьюринга
-BLANK_SYMBOL = '_'  # Символ пустой ячейки
-LEFT_END = 0  # Начальная позиция головки
-MAX_HISTORY_LEN = 1000  # Максимальная глубина истории для отката
+BLANK_SYMBOL: Final[str] = '_'  # Символ пустой ячейки (только для ввода-вывода ленты)
+BLANK_BYTE: Final[int] = 0  # Номер пустого символа на ленте
+MAX_SYMBOLS: Final[int] = 256  # Максимальное число различных символов ленты (один байт на ячейку)
+LEFT_END: Final[int] = 0  # Начальная позиция головки
+MAX_HISTORY_LEN: Final[int] = 1000  # Максимальная глубина истории для отката (maxlen очереди TuringMachine.history)
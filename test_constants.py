@@ -0,0 +1,56 @@
+# test_constants.py
+"""
+Тесты базовых классов машины Тьюринга.
+
+Запуск: python -m unittest
+"""
+
+import copy
+import pickle
+import unittest
+
+from constants import InvalidDirectionError, StateInfo, Transition
+
+
+class TransitionFromStrTest(unittest.TestCase):
+    """Проверки разбора строки инструкции в Transition.from_str."""
+
+    def test_invalid_direction_keeps_character(self):
+        with self.assertRaises(InvalidDirectionError) as context:
+            Transition.from_str('1 q1 ^')
+        self.assertIn('^', str(context.exception))
+
+
+class TransitionParseManyTest(unittest.TestCase):
+    """Проверки разбора текста с несколькими инструкциями в Transition.parse_many."""
+
+    def test_blank_lines_are_skipped(self):
+        transitions = Transition.parse_many('1 q1 <\n\n   \n_ q0 !\n')
+        self.assertEqual([t.to_str() for t in transitions], ['1 q1 <', '_ q0 !'])
+
+    def test_crlf_line_endings(self):
+        transitions = Transition.parse_many('1 q1 <\r\n_ q0 !\r\n')
+        self.assertEqual([t.to_str() for t in transitions], ['1 q1 <', '_ q0 !'])
+
+    def test_invalid_line_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Transition.parse_many('1 q1 <\nzz\n')
+
+    def test_dump_many_round_trip(self):
+        transitions = Transition.parse_many('1 q1 <\n_ q0 !')
+        self.assertEqual(Transition.parse_many(Transition.dump_many(transitions) + '\n'), transitions)
+
+
+
+class StateInfoTest(unittest.TestCase):
+    """Проверки неизменяемого снимка состояния StateInfo."""
+
+    def test_pickle_and_copy(self):
+        info = StateInfo('q0', 1, b'\x00\x01', 5)
+        self.assertEqual(pickle.loads(pickle.dumps(info)), info)
+        self.assertEqual(copy.copy(info), info)
+        self.assertEqual(hash(copy.deepcopy(info)), hash(info))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+# test_turing_machine.py
+"""
+Тесты класса TuringMachine.
+
+Запуск: python -m unittest
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import tm_core
+from TuringMachine import TuringMachine, InvalidTransitionError
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Examples')
+EXAMPLES = ('bubble_sort.tur', 'eratosfen.tur')
+
+
+def make_growing_machine():
+    """Машина, которая расширяет ленту сначала влево, затем вправо и останавливается."""
+    machine = TuringMachine()
+    machine.new_transition('q0', '1', '1 q0 <')
+    machine.new_transition('q0', '_', 'a q1 >')
+    machine.new_transition('q1', '1', '1 q1 >')
+    machine.new_transition('q1', '_', 'b q2 .')
+    machine.new_transition('q2', 'b', 'b q2 !')
+    machine.set_tape(['1'])
+    return machine
+
+
+def tape_text(machine):
+    """Возвращает ленту машины строкой символов."""
+    return ''.join(machine.get_symbol(symbol_id) for symbol_id in machine.get_state_info().tape)
+
+
+class LoadFromFileTest(unittest.TestCase):
+    """Проверки загрузки программы из JSON файла."""
+
+    def load(self, states, tape=('_',)):
+        fd, filename = tempfile.mkstemp(suffix='.tur')
+        self.addCleanup(os.remove, filename)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'tape': list(tape), 'states': states}, f)
+        return TuringMachine.load_from_file(filename)
+
+    def test_cell_with_line_break_is_rejected(self):
+        # Две строки в одной ячейке и пустая соседняя не должны сдвигать переходы
+        with self.assertRaises(InvalidTransitionError):
+            self.load({'q0': {'_': '1 q0 >\n1 q0 !', '1': ''}})
+
+    def test_transitions_are_mapped_to_their_cells(self):
+        machine = self.load({'q0': {'_': '1 q0 >', '1': '_ q1 <'}, 'q1': {'_': '_ q1 !'}})
+        self.assertEqual(machine.states['q0']['_'].to_str(), '1 q0 >')
+        self.assertEqual(machine.states['q0']['1'].to_str(), '_ q1 <')
+        self.assertEqual(machine.states['q1']['_'].to_str(), '_ q1 !')
+
+
+
+class StepBackTest(unittest.TestCase):
+    """Проверки отката шагов по истории изменений."""
+
+    def test_undo_restores_every_configuration(self):
+        machine = make_growing_machine()
+        snapshots = [machine.get_state_info()]
+        while machine.run_transition():
+            snapshots.append(machine.get_state_info())
+        snapshots.append(machine.get_state_info())
+        self.assertEqual(tape_text(machine), 'a1b')
+
+        # Последний снимок - состояние после остановки
+        for expected in reversed(snapshots[:-1]):
+            self.assertEqual(machine.step_back(), 1)
+            self.assertEqual(machine.get_state_info(), expected)
+        self.assertEqual(machine.step_back(), 0)
+        self.assertEqual(tape_text(machine), '1')
+
+    def test_run_after_undo_matches_first_run(self):
+        machine = make_growing_machine()
+        machine.run()
+        expected = machine.get_state_info()
+        while machine.step_back():
+            pass
+        machine.run()
+        self.assertEqual(machine.get_state_info(), expected)
+
+
+class RunFastTest(unittest.TestCase):
+    """Проверки совпадения run_fast (интерпретатор и ядро tm_core) с пошаговым run."""
+
+    def check_examples(self, use_core):
+        for name in EXAMPLES:
+            with self.subTest(example=name, use_core=use_core):
+                filename = os.path.join(EXAMPLES_DIR, name)
+                expected = TuringMachine.load_from_file(filename)
+                expected.run()
+                machine = TuringMachine.load_from_file(filename)
+                with mock.patch.object(tm_core, 'NUMBA_AVAILABLE', use_core):
+                    self.assertEqual(machine.run_fast(), 0)
+                self.assertEqual(machine.get_state_info(), expected.get_state_info())
+
+    def test_interpreted_loop_matches_run(self):
+        self.check_examples(use_core=False)
+
+    def test_core_kernel_matches_run(self):
+        self.check_examples(use_core=True)
+
+    def test_tape_growth_in_both_directions(self):
+        expected = make_growing_machine()
+        expected.run()
+        for use_core in (False, True):
+            with self.subTest(use_core=use_core):
+                machine = make_growing_machine()
+                with mock.patch.object(tm_core, 'NUMBA_AVAILABLE', use_core):
+                    self.assertEqual(machine.run_fast(), 0)
+                self.assertEqual(machine.get_state_info(), expected.get_state_info())
+
+    def test_step_limit(self):
+        machine = TuringMachine()
+        machine.new_transition('q0', '_', '1 q0 <')
+        for use_core in (False, True):
+            with self.subTest(use_core=use_core):
+                machine.set_tape(['_'])
+                machine.step_count = 0
+                with mock.patch.object(tm_core, 'NUMBA_AVAILABLE', use_core):
+                    self.assertEqual(machine.run_fast(max_steps=100), 1)
+                self.assertEqual(machine.step_count, 100)
+                self.assertEqual(tape_text(machine), '_' + '1' * 100)
+
+
+class BinaryFileTest(unittest.TestCase):
+    """Проверки сохранения и загрузки программы в двоичном формате."""
+
+    def test_round_trip(self):
+        machine = TuringMachine.load_from_file(os.path.join(EXAMPLES_DIR, EXAMPLES[0]))
+        fd, filename = tempfile.mkstemp(suffix='.turb')
+        os.close(fd)
+        self.addCleanup(os.remove, filename)
+        machine.save_to_file_bin(filename)
+        loaded = TuringMachine.load_from_file_bin(filename)
+
+        self.assertEqual(loaded.states, machine.states)
+        self.assertEqual(tape_text(loaded), tape_text(machine))
+        for row in loaded.states.values():
+            for transition in row.values():
+                self.assertIs(transition.next_state, sys.intern(transition.next_state))
+                self.assertIs(transition.write_symbol, sys.intern(transition.write_symbol))
+
+        machine.run()
+        loaded.run()
+        self.assertEqual(loaded.get_state_info(), machine.get_state_info())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# tm_core.py
+"""
+Ядро быстрого выполнения машины Тьюринга.
+
+Таблица переходов хранится одним массивом 64-битных чисел, индексируемым
+номером состояния * MAX_SYMBOLS + номер символа. Каждый элемент упаковывает
+весь переход: (next_base << 16) | (write_id << 8) | (delta & 0xFF), где
+- next_base: номер следующего состояния * MAX_SYMBOLS
+- write_id: номер записываемого символа
+- delta: смещение головки (или STOP_DELTA для остановки)
+Отрицательный элемент - код ошибки NO_TRANSITION или INVALID_STATE.
+
+Если установлен numba, цикл выполнения компилируется в машинный код при
+первом вызове run, иначе выполняется как обычная функция Python. Сам numba
+импортируется тоже только при первом вызове, чтобы не замедлять запуск.
+"""
+
+from array import array
+from importlib.util import find_spec
+
+# Проверка наличия numba без его импорта
+NUMBA_AVAILABLE = find_spec('numba') is not None
+
+# Элементы таблицы для отсутствующих переходов
+NO_TRANSITION = -1  # нет перехода для символа
+INVALID_STATE = -2  # переход в несуществующее состояние
+
+# Смещение головки для остановочного перехода: признак остановки хранится
+# в байте смещения, а не отдельным полем, и следующее состояние сохраняется
+STOP_DELTA = 2
+
+# Коды завершения run (отрицательные коды совпадают с элементами таблицы)
+HALTED = 0  # машина остановилась
+STEPS_EXHAUSTED = 1  # достигнут предел шагов
+LEFT_EDGE = 2  # головка вышла за левый край буфера ленты
+RIGHT_EDGE = 3  # головка вышла за правый край буфера ленты
+
+
+def build_table(dispatch: list):
+    """Строит упакованную таблицу переходов по плоской таблице TuringMachine._compile."""
+    table = array('q', [NO_TRANSITION]) * len(dispatch)
+    for index, entry in enumerate(dispatch):
+        if entry is None:
+            continue
+        next_base, write_id, offset, halting, _ = entry
+        if next_base < 0:
+            table[index] = INVALID_STATE
+            continue
+        delta = STOP_DELTA if halting else offset
+        table[index] = (next_base << 16) | (write_id << 8) | (delta & 0xFF)
+
+    return table
+
+
+def _run(tape, head, base, table, max_steps, lo, hi):
+    """Выполняет до max_steps шагов на ленте tape[lo:hi], расширяя её за счёт запаса буфера.
+
+    Ячейки tape вне [lo, hi) - пустой запас. Когда головка выходит за lo или hi,
+    граница сдвигается; выполнение прерывается, только когда головка выходит
+    за край самого буфера tape: выделение нового запаса остаётся на стороне
+    вызывающего кода.
+
+    Returns:
+        Кортеж (код завершения, base, head, число выполненных шагов, lo, hi).
+        При кодах NO_TRANSITION и INVALID_STATE шаг на позиции head не выполнен.
+        При LEFT_EDGE head = lo = -1, при RIGHT_EDGE head = len(tape), hi = head + 1.
+    """
+    steps = 0
+    while steps < max_steps:
+        slot = table[base + tape[head]]
+        if slot < 0:
+            return slot, base, head, steps, lo, hi
+
+        tape[head] = (slot >> 8) & 0xFF
+        base = slot >> 16
+        steps += 1
+
+        # Младший байт - знаковое смещение головки
+        delta = ((slot & 0xFF) ^ 0x80) - 0x80
+        if delta == STOP_DELTA:
+            return HALTED, base, head, steps, lo, hi
+
+        head += delta
+        if head < lo:
+            lo = head
+            if head < 0:
+                return LEFT_EDGE, base, head, steps, lo, hi
+        elif head == hi:
+            hi = head + 1
+            if hi > len(tape):
+                return RIGHT_EDGE, base, head, steps, lo, hi
+    return STEPS_EXHAUSTED, base, head, steps, lo, hi
+
+
+_kernel = None  # скомпилированный _run, создается при первом вызове run
+
+
+def run(tape, head, base, table, max_steps, lo, hi):
+    """Выполняет _run, компилируя его через numba при первом вызове."""
+    global _kernel
+    if _kernel is None:
+        try:
+            from numba import njit
+            _kernel = njit(cache=True)(_run)
+        except ImportError:
+            _kernel = _run
+    return _kernel(tape, head, base, table, max_steps, lo, hi)